@@ -0,0 +1,214 @@
+import numpy as np
+from numba import njit, types
+from numba.typed import Dict, List
+
+# Packed goal state [[0, 1, 2], [3, 4, 5], [6, 7, 8]] with one tile per 4-bit nibble.
+GOAL_STATE = 0x876543210
+
+# Number of f-value buckets in the A* open list; f never exceeds the optimal
+# solution length (at most 31) by more than a few moves.
+MAX_F = 64
+
+# Item type of an A* bucket: a (state, g) pair.
+_BUCKET_ITEM = types.UniTuple(types.int64, 2)
+
+
+@njit(cache=True)
+def _linear_conflicts(state, row_conflict, col_conflict):
+    """
+    Sums the linear conflict penalties of all rows and columns of a packed state.
+    """
+    conflicts = 0
+    for line in range(3):
+        conflicts += row_conflict[line, (state >> (12 * line)) & 0xFFF]
+        shift = 4 * line
+        col = ((state >> shift) & 0xF) | ((state >> (shift + 8)) & 0xF0) | ((state >> (shift + 16)) & 0xF00)
+        conflicts += col_conflict[line, col]
+    return conflicts
+
+
+@njit(cache=True)
+def a_star_nb(start_state, table, moves, row_conflict, col_conflict):
+    """
+    Runs the A* algorithm on a packed puzzle state in Numba's nopython mode.
+
+    Reference solver for cross-checking ida_star_nb; main() does not call it.
+
+    Parameters:
+    - start_state: The start state of the puzzle as a packed integer.
+    - table: A (9, 9) int64 array with the heuristic contribution of every tile at every position.
+    - moves: A (9, 4, 3) int8 array holding (new_zero_index, shift_src, shift_dst)
+      for every blank position, padded with -1 for invalid moves.
+    - row_conflict, col_conflict: (3, 4096) int64 arrays with the linear conflict
+      penalty of every row and column pattern; all zeros to disable the penalty.
+
+    Returns:
+    - A tuple containing the path cost (g) and the number of expanded nodes,
+      or (-1, expanded nodes) if the open list runs out without reaching the goal.
+    """
+    h = 0
+    for pos in range(9):
+        h += table[(start_state >> (4 * pos)) & 0xF, pos]
+    h += _linear_conflicts(start_state, row_conflict, col_conflict)
+
+    # Bucket queue: open_list[f] holds the (state, g) pairs with that f value.
+    open_list = List()
+    for _ in range(MAX_F):
+        open_list.append(List.empty_list(_BUCKET_ITEM))
+    open_list[h].append((start_state, 0))
+    min_f = h
+    best_g = Dict.empty(key_type=types.int64, value_type=types.int64)
+    best_g[start_state] = 0
+    closed_list = set()
+    expanded_nodes = 0
+
+    while True:
+        while min_f < MAX_F and len(open_list[min_f]) == 0:
+            min_f += 1
+        if min_f == MAX_F:
+            return -1, expanded_nodes
+        state, g = open_list[min_f].pop()
+        f = min_f
+        expanded_nodes += 1
+
+        if state in closed_list:
+            continue
+        closed_list.add(state)
+
+        if state == GOAL_STATE:
+            return g, expanded_nodes
+
+        zero_index = 0
+        while (state >> (4 * zero_index)) & 0xF:
+            zero_index += 1
+
+        # Table part of the current h; the linear conflicts are recomputed per successor.
+        h_table = f - g - _linear_conflicts(state, row_conflict, col_conflict)
+        new_g = g + 1
+        for k in range(4):
+            new_zero_index = np.int64(moves[zero_index, k, 0])
+            if new_zero_index < 0:
+                break
+            shift_src = np.int64(moves[zero_index, k, 1])
+            shift_dst = np.int64(moves[zero_index, k, 2])
+            tile = (state >> shift_dst) & 0xF
+            successor = state ^ (tile << shift_src) ^ (tile << shift_dst)
+            if successor in closed_list:
+                continue
+            if successor in best_g and best_g[successor] <= new_g:
+                continue
+            best_g[successor] = new_g
+            h = (h_table + table[tile, zero_index] - table[tile, new_zero_index]
+                 + _linear_conflicts(successor, row_conflict, col_conflict))
+            open_list[new_g + h].append((successor, new_g))
+            min_f = min(min_f, new_g + h)
+
+
+# Upper bound for the IDA* search depth; no 8-puzzle needs more than 31 moves.
+MAX_DEPTH = 64
+
+
+@njit(cache=True)
+def ida_star_nb(start_state, table, moves, row_conflict, col_conflict):
+    """
+    Runs the IDA* algorithm on a packed puzzle state in Numba's nopython mode.
+
+    The depth-first search uses an explicit stack of fixed size, so memory use
+    is bounded by the search depth rather than the number of expanded nodes.
+
+    Parameters:
+    - start_state: The start state of the puzzle as a packed integer.
+    - table: A (9, 9) int64 array with the heuristic contribution of every tile at every position.
+    - moves: A (9, 4, 3) int8 array holding (new_zero_index, shift_src, shift_dst)
+      for every blank position, padded with -1 for invalid moves.
+    - row_conflict, col_conflict: (3, 4096) int64 arrays with the linear conflict
+      penalty of every row and column pattern; all zeros to disable the penalty.
+
+    Returns:
+    - A tuple containing the path cost (g) and the number of expanded nodes,
+      or (-1, 0) if the puzzle is not solvable.
+    """
+    # Reject unsolvable puzzles up front: the search below would only stop at
+    # MAX_DEPTH, which takes exponentially long.
+    inversions = 0
+    for i in range(9):
+        tile_i = (start_state >> (4 * i)) & 0xF
+        for j in range(i + 1, 9):
+            tile_j = (start_state >> (4 * j)) & 0xF
+            if tile_j != 0 and tile_i > tile_j:
+                inversions += 1
+    if inversions % 2 != 0:
+        return -1, 0
+
+    # hs holds the table part of h; linear conflicts are added on top.
+    states = np.empty(MAX_DEPTH, dtype=np.int64)
+    hs = np.empty(MAX_DEPTH, dtype=np.int64)
+    zero_indices = np.empty(MAX_DEPTH, dtype=np.int64)
+    parent_zero_indices = np.empty(MAX_DEPTH, dtype=np.int64)
+    next_moves = np.empty(MAX_DEPTH, dtype=np.int64)
+
+    h = 0
+    zero_index = -1
+    for pos in range(9):
+        tile = (start_state >> (4 * pos)) & 0xF
+        h += table[tile, pos]
+        if tile == 0:
+            zero_index = pos
+
+    bound = h + _linear_conflicts(start_state, row_conflict, col_conflict)
+    expanded_nodes = 0
+    while bound < MAX_DEPTH:
+        states[0] = start_state
+        hs[0] = h
+        zero_indices[0] = zero_index
+        parent_zero_indices[0] = -1
+        next_moves[0] = 0
+        expanded_nodes += 1
+        if start_state == GOAL_STATE:
+            return 0, expanded_nodes
+
+        next_bound = MAX_DEPTH
+        depth = 0
+        while depth >= 0:
+            k = next_moves[depth]
+            zero_index = zero_indices[depth]
+            if k == 4 or moves[zero_index, k, 0] < 0:
+                depth -= 1
+                continue
+            next_moves[depth] = k + 1
+
+            new_zero_index = np.int64(moves[zero_index, k, 0])
+            if new_zero_index == parent_zero_indices[depth]:  # Do not undo the previous move
+                continue
+            state = states[depth]
+            shift_src = np.int64(moves[zero_index, k, 1])
+            shift_dst = np.int64(moves[zero_index, k, 2])
+            tile = (state >> shift_dst) & 0xF
+            successor = state ^ (tile << shift_src) ^ (tile << shift_dst)
+            successor_h = hs[depth] + table[tile, zero_index] - table[tile, new_zero_index]
+            f = depth + 1 + successor_h + _linear_conflicts(successor, row_conflict, col_conflict)
+            if f > bound:
+                next_bound = min(next_bound, f)
+                continue
+
+            expanded_nodes += 1
+            if successor == GOAL_STATE:
+                return depth + 1, expanded_nodes
+            depth += 1
+            states[depth] = successor
+            hs[depth] = successor_h
+            zero_indices[depth] = new_zero_index
+            parent_zero_indices[depth] = zero_index
+            next_moves[depth] = 0
+        bound = next_bound
+
+    return -1, expanded_nodes
+
+
+# Compile ida_star_nb once at import so the first solved puzzle does not pay for
+# the JIT. a_star_nb is a reference solver that main() does not use, so it is
+# only compiled when it is first called.
+_warmup_table = np.zeros((9, 9), dtype=np.int64)
+_warmup_moves = np.full((9, 4, 3), -1, dtype=np.int8)
+_warmup_conflict = np.zeros((3, 4096), dtype=np.int64)
+id
\ No newline at end of file